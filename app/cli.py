@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import os
 import sys
+from itertools import chain
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 import click
-import joblib
-import pandas as pd
 
-from app.constants import TOKENIZER_CACHE_DIR
+from app.constants import TOKENIZER_CACHE_DIR, ensure_dirs
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 __all__ = ["cli_wrapper"]
 
@@ -23,7 +26,7 @@ def _load_dataset(
     batch_size: int = 512,
     n_jobs: int = 4,
     force_cache: bool = False,
-) -> tuple[pd.Series, pd.Series]:
+) -> tuple[pd.Series, np.ndarray]:
     """Helper function to load and tokenize the dataset or use cached data if available.
 
     Args:
@@ -35,11 +38,18 @@ def _load_dataset(
     Returns:
         Tokenized text data and label data
     """
-    from app.data import load_data, tokenize
+    import numpy as np
+    import pandas as pd
+
+    from app.data import load_data, tokenize, tokenizer_version
     from app.utils import deserialize, serialize
 
-    token_cache_path = TOKENIZER_CACHE_DIR / f"{dataset}_tokenized.pkl"
-    label_cache_path = TOKENIZER_CACHE_DIR / f"{dataset}_labels.pkl"
+    ensure_dirs()
+    # Key the cache on the tokenizer version so that it is invalidated when the tokenizer changes
+    cache_prefix = f"{dataset}_{tokenizer_version()}"
+    token_cache_path = TOKENIZER_CACHE_DIR / f"{cache_prefix}_tokenized.npy"
+    label_cache_path = TOKENIZER_CACHE_DIR / f"{cache_prefix}_labels.npy"
+    vocab_cache_path = TOKENIZER_CACHE_DIR / f"{cache_prefix}_vocab_size.txt"
     use_cached_data = False
 
     if token_cache_path.exists() and label_cache_path.exists():
@@ -51,8 +61,14 @@ def _load_dataset(
     if use_cached_data:
         click.echo("Loading cached data... ", nl=False)
         token_data = pd.Series(deserialize(token_cache_path))
-        label_data = joblib.load(label_cache_path)
+        label_data = np.load(label_cache_path, mmap_mode="r")
         click.echo(DONE_STR)
+
+        if vocab_cache_path.exists():
+            vocab_size = int(vocab_cache_path.read_text())
+        else:
+            vocab_size = len(set(chain.from_iterable(token_data)))
+            vocab_cache_path.write_text(str(vocab_size))
     else:
         click.echo("Loading dataset... ", nl=False)
         text_data, label_data = load_data(dataset)
@@ -60,12 +76,13 @@ def _load_dataset(
 
         click.echo("Tokenizing data... ")
         token_data = tokenize(text_data, batch_size=batch_size, n_jobs=n_jobs, show_progress=True)
-        serialize(token_data, token_cache_path, show_progress=True)
-        joblib.dump(label_data, label_cache_path, compress=3)
+        vocab_size = serialize(token_data, token_cache_path, show_progress=True)
+        vocab_cache_path.write_text(str(vocab_size))
+        label_data = np.asarray(label_data, dtype=np.int8)
+        np.save(label_cache_path, label_data)
 
     click.echo("Dataset vocabulary size: ", nl=False)
-    vocab = token_data.explode().value_counts()
-    click.secho(str(len(vocab)), fg="blue")
+    click.secho(str(vocab_size), fg="blue")
 
     return token_data, label_data
 
@@ -110,20 +127,18 @@ def predict(model_path: Path, text: list[str]) -> None:
     Note: Piped input takes precedence over the text argument
     """
     from app.model import infer_model
+    from app.utils import load_model
 
-    # Combine the text arguments into a single string
-    text = " ".join(text).strip()
-    if not sys.stdin.isatty():
-        # If there is piped input, read it
-        piped_text = sys.stdin.read().strip()
-        text = piped_text or text
+    # If there is piped input, read it in one go, otherwise combine the text arguments into a single string
+    piped_text = "" if sys.stdin.isatty() else sys.stdin.buffer.read().decode("utf-8", errors="ignore").strip()
+    text = piped_text or " ".join(text).strip()
 
     if not text:
         msg = "No text provided"
         raise click.UsageError(msg)
 
     click.echo("Loading model... ", nl=False)
-    model = joblib.load(model_path)
+    model = load_model(model_path)
     click.echo(DONE_STR)
 
     click.echo("Performing sentiment analysis... ", nl=False)
@@ -192,11 +207,12 @@ def evaluate(
 ) -> None:
     """Evaluate the model on the the specified dataset"""
     from app.model import evaluate_model
+    from app.utils import load_model
 
     token_data, label_data = _load_dataset(dataset, token_batch_size, token_jobs, force_cache)
 
     click.echo("Loading model... ", nl=False)
-    model = joblib.load(model_path)
+    model = load_model(model_path)
     click.echo(DONE_STR)
 
     click.echo("Evaluating model... ")
@@ -292,9 +308,12 @@ def train(
     force_cache: bool,
 ) -> None:
     """Train the model on the provided dataset"""
+    import joblib
+
     from app.constants import MODEL_DIR
     from app.model import train_model
 
+    ensure_dirs()
     model_path = MODEL_DIR / f"{dataset}_{vectorizer}_ft{max_features}.pkl"
     if model_path.exists() and not overwrite:
         click.confirm(f"Model file '{model_path}' already exists. Overwrite?", abort=True)
@@ -317,7 +336,7 @@ def train(
     click.secho(f"{accuracy:.2%}", fg="blue")
 
     click.echo("Model saved to: ", nl=False)
-    joblib.dump(model, model_path, compress=3)
+    joblib.dump(model, model_path)  # Uncompressed so it can be memory-mapped on load
     click.secho(str(model_path), fg="blue")
 
 
@@ -6,16 +6,9 @@ import os
 from pathlib import Path
 
 CACHE_DIR = Path(os.getenv("CACHE_DIR", ".cache"))
-CACHE_DIR.mkdir(exist_ok=True, parents=True)
-
 DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
-DATA_DIR.mkdir(exist_ok=True, parents=True)
-
 MODEL_DIR = Path(os.getenv("MODEL_DIR", "models"))
-MODEL_DIR.mkdir(exist_ok=True, parents=True)
-
 TOKENIZER_CACHE_DIR = CACHE_DIR / "tokenizer"
-TOKENIZER_CACHE_DIR.mkdir(exist_ok=True, parents=True)
 
 SENTIMENT140_PATH = DATA_DIR / "sentiment140.csv"
 SENTIMENT140_URL = "https://www.kaggle.com/datasets/kazanova/sentiment140"
@@ -31,3 +24,9 @@ TEST_DATASET_URL = "https://github.com/Tymec/sentiment-analysis/blob/main/data/t
 
 SLANGMAP_PATH = DATA_DIR / "slang.json"
 SLANGMAP_URL = "https://github.com/Tymec/sentiment-analysis/blob/main/data/slang.json?raw=true"
+
+
+def ensure_dirs() -> None:
+    """Create the cache, data and model directories if they do not exist."""
+    for path in (CACHE_DIR, DATA_DIR, MODEL_DIR, TOKENIZER_CACHE_DIR):
+        path.mkdir(exist_ok=True, parents=True)
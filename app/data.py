@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import bz2
-import json
+import hashlib
 import re
 from functools import lru_cache
-from typing import TYPE_CHECKING, Literal, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Literal, Sequence
 
 import emoji
+import orjson
 import pandas as pd
 import spacy
 from joblib import Parallel, delayed
@@ -32,7 +34,7 @@ if TYPE_CHECKING:
 
     from spacy.tokens import Doc
 
-__all__ = ["load_data", "tokenize"]
+__all__ = ["load_data", "tokenize", "tokenizer_version"]
 
 
 try:
@@ -45,11 +47,58 @@ except OSError:
     spacy_download("en_core_web_sm")
     nlp = spacy.load("en_core_web_sm")
 
+# Patterns used by `_clean`, compiled once at import instead of on every call
+_HTML_PATTERN = re.compile(r"<[^>]*>")
+_ACRONYM_PATTERN = re.compile(r"\b(?:[a-z]\.?)(?:[a-z]\.)\b")
+_HONORIFIC_PATTERN = re.compile(r"\b(?:mr|mrs|ms|dr|prof|sr|jr)\.?\b")
+_YEAR_PATTERN = re.compile(r"\b(?:\d{3}0|\d0)s?\b")
+_HASHTAG_PATTERN = re.compile(r"#[^\s]+")
+_MENTION_PATTERN = re.compile(r"@[^\s]+")
+_ALTERNATIVE_PATTERN = re.compile(r"\b([a-z]+)[//]([a-z]+)\b")
+_SPECIAL_CHAR_PATTERN = re.compile(r"[^a-z0-9\s]")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a re pattern matching any of the words, with shared prefixes merged into a trie.
+
+    Unlike a flat alternation, which tries every word at each position, the trie pattern
+    branches on one character at a time, so each position is matched in a single pass.
+    Where words overlap, the longest one that satisfies the rest of the pattern wins
+    (e.g. "w/o" rather than "w/"), regardless of the order of `words`.
+
+    Args:
+        words: Words to match
+
+    Returns:
+        Pattern string (without enclosing group)
+    """
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of word marker
+
+    def _to_pattern(node: dict[str, dict]) -> str:
+        branches = [re.escape(char) + _to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional so longer words are tried first
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return _to_pattern(trie)
+
 
 @lru_cache(maxsize=1)
 def slang() -> tuple[Pattern, dict[str, str]]:
     """Compile a re pattern for slang terms.
 
+    Overlapping terms are matched longest first, so "w/o" maps to "without" instead of "w/" + "o".
+
     Returns:
         Slang pattern and mapping
 
@@ -64,10 +113,26 @@ def slang() -> tuple[Pattern, dict[str, str]]:
         )  # fmt: off
         raise FileNotFoundError(msg)
 
-    with SLANGMAP_PATH.open() as f:
-        mapping = json.load(f)
+    mapping = orjson.loads(SLANGMAP_PATH.read_bytes())
 
-    return re.compile(r"\b(" + "|".join(map(re.escape, mapping.keys())) + r")\b"), mapping
+    return re.compile(r"\b(" + _trie_pattern(mapping.keys()) + r")\b"), mapping
+
+
+@lru_cache(maxsize=1)
+def tokenizer_version() -> str:
+    """Compute a version tag for the tokenizer.
+
+    The tag changes whenever this module, the spaCy model or the slang mapping changes,
+    so it can be used to key cached tokenized data.
+
+    Returns:
+        Short hexadecimal version tag
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(f"{nlp.meta['name']}-{nlp.meta['version']}".encode())
+    if SLANGMAP_PATH.exists():
+        digest.update(SLANGMAP_PATH.read_bytes())
+    return digest.hexdigest()[:12]
 
 
 def _clean(text: str) -> str:
@@ -83,42 +148,55 @@ def _clean(text: str) -> str:
     text = text.lower()
 
     # Remove HTML tags
-    text = re.sub(r"<[^>]*>", "", text)
+    text = _HTML_PATTERN.sub("", text)
 
     # Map slang terms
     slang_pattern, slang_mapping = slang()
     text = slang_pattern.sub(lambda x: slang_mapping[x.group()], text)
 
     # Remove acronyms and abbreviations
-    text = re.sub(r"\b(?:[a-z]\.?)(?:[a-z]\.)\b", "", text)
+    text = _ACRONYM_PATTERN.sub("", text)
 
     # Remove honorifics
-    text = re.sub(r"\b(?:mr|mrs|ms|dr|prof|sr|jr)\.?\b", "", text)
+    text = _HONORIFIC_PATTERN.sub("", text)
 
     # Remove year abbreviations
-    text = re.sub(r"\b(?:\d{3}0|\d0)s?\b", "", text)
+    text = _YEAR_PATTERN.sub("", text)
 
     # Remove hashtags
-    text = re.sub(r"#[^\s]+", "", text)
+    text = _HASHTAG_PATTERN.sub("", text)
 
     # Replace mentions with a generic tag
-    text = re.sub(r"@[^\s]+", "user", text)
+    text = _MENTION_PATTERN.sub("user", text)
 
     # Replace X/Y with X or Y
-    text = re.sub(r"\b([a-z]+)[//]([a-z]+)\b", r"\1 or \2", text)
+    text = _ALTERNATIVE_PATTERN.sub(r"\1 or \2", text)
 
-    # Convert emojis to text
-    text = emoji.demojize(text, delimiters=("emoji_", ""))
+    # Convert emojis to text (no emoji is pure ASCII, so skip the costly scan for ASCII-only text)
+    if not text.isascii():
+        text = emoji.demojize(text, delimiters=("emoji_", ""))
 
     # Remove special characters
-    text = re.sub(r"[^a-z0-9\s]", "", text)
+    text = _SPECIAL_CHAR_PATTERN.sub("", text)
 
     # EXTRA: imdb50k specific cleaning
-    text = re.sub(r"mst3k", "", text)  # Very common acronym for Mystery Science Theater 3000
+    text = text.replace("mst3k", "")  # Very common acronym for Mystery Science Theater 3000
 
     return text.strip()
 
 
+def _clean_batch(text_data: Sequence[str]) -> list[str]:
+    """Perform basic text cleaning on a batch of documents.
+
+    Args:
+        text_data: Text data to clean
+
+    Returns:
+        Cleaned text data
+    """
+    return [_clean(text) for text in text_data]
+
+
 def _lemmatize(doc: Doc, threshold: int = 3) -> Sequence[str]:
     """Lemmatize the provided text using spaCy.
 
@@ -161,15 +239,20 @@ def tokenize(
     Returns:
         Tokenized text data
     """
-    text_data = Parallel(n_jobs=n_jobs)(
-        delayed(_clean)(text)
-        for text in tqdm(
-            text_data,
-            desc="Cleaning",
-            unit="doc",
-            disable=not show_progress,
+    # Dispatch whole batches to the workers instead of one document per task
+    text_data = [
+        text
+        for batch in Parallel(n_jobs=n_jobs)(
+            delayed(_clean_batch)(text_data[i : i + batch_size])
+            for i in tqdm(
+                range(0, len(text_data), batch_size),
+                desc="Cleaning",
+                unit="batch",
+                disable=not show_progress,
+            )
         )
-    )
+        for text in batch
+    ]
     return pd.Series(
         [
             _lemmatize(doc, character_threshold)
@@ -217,6 +300,7 @@ def load_sentiment140(include_neutral: bool = False) -> tuple[list[str], list[in
             "user",  # The user that tweeted
             "text",  # The text of the tweet
         ],
+        usecols=["target", "text"],
     )
 
     # Ignore rows with neutral sentiment
@@ -254,12 +338,10 @@ def load_amazonreviews() -> tuple[list[str], list[int]]:
         )
         raise FileNotFoundError(msg)
 
-    # Load the dataset
-    with bz2.BZ2File(AMAZONREVIEWS_PATH) as f:
-        dataset = [line.decode("utf-8") for line in f]
-
-    # Split the data into labels and text
-    labels, texts = zip(*(line.split(" ", 1) for line in dataset))
+    # Load the dataset and split it into labels and text while decompressing
+    # (newline="\n" keeps the line splitting identical to reading the raw bytes)
+    with bz2.open(AMAZONREVIEWS_PATH, "rt", encoding="utf-8", newline="\n") as f:
+        labels, texts = zip(*(line.split(" ", 1) for line in f))
 
     # Map sentiment values
     sentiments = [int(label.split("__label__")[1]) - 1 for label in labels]
@@ -287,7 +369,7 @@ def load_imdb50k() -> tuple[list[str], list[int]]:
         raise FileNotFoundError(msg)
 
     # Load the dataset
-    data = pd.read_csv(IMDB50K_PATH)
+    data = pd.read_csv(IMDB50K_PATH, usecols=["review", "sentiment"])
 
     # Map sentiment values
     data["sentiment"] = data["sentiment"].map(
@@ -320,7 +402,7 @@ def load_test() -> tuple[list[str], list[int]]:
         raise FileNotFoundError(msg)
 
     # Load the dataset
-    data = pd.read_csv(TEST_DATASET_PATH)
+    data = pd.read_csv(TEST_DATASET_PATH, usecols=["text", "sentiment"])
 
     # Return as lists
     return data["text"].tolist(), data["sentiment"].tolist()
@@ -7,9 +7,9 @@ from functools import lru_cache
 from typing import TYPE_CHECKING
 
 import gradio as gr
-import joblib
 
 from app.model import infer_model
+from app.utils import load_model as load_model_file
 
 if TYPE_CHECKING:
     from sklearn.base import BaseEstimator
@@ -33,7 +33,7 @@ def load_model() -> BaseEstimator:
     if model_path is None:
         msg = "MODEL_PATH environment variable not set"
         raise ValueError(msg)
-    return joblib.load(model_path)
+    return load_model_file(model_path)
 
 
 def sentiment_analysis(text: str) -> str:
@@ -5,14 +5,6 @@ from __future__ import annotations
 import warnings
 from typing import TYPE_CHECKING, Literal, Sequence
 
-import numpy as np
-from joblib import Memory
-from sklearn.exceptions import ConvergenceWarning
-from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import RandomizedSearchCV, cross_val_score, train_test_split
-from sklearn.pipeline import Pipeline
-
 from app.constants import CACHE_DIR
 from app.data import tokenize
 
@@ -52,6 +44,8 @@ def _get_vectorizer(
     Raises:
         ValueError: If the vectorizer is not recognized
     """
+    from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+
     shared_params = {
         "ngram_range": (1, 2),  # unigrams and bigrams
         # disable text processing
@@ -118,6 +112,14 @@ def train_model(
     Raises:
         ValueError: If the vectorizer is not recognized
     """
+    # Training-only dependencies are imported here so that inference does not pay for them
+    import numpy as np
+    from joblib import Memory
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import RandomizedSearchCV, train_test_split
+    from sklearn.pipeline import Pipeline
+
     rs = None if seed == -1 else seed
 
     # Split the data into training and testing sets
@@ -178,6 +180,8 @@ def evaluate_model(
     Returns:
         Mean accuracy and standard deviation
     """
+    from sklearn.model_selection import cross_val_score
+
     with warnings.catch_warnings():
         warnings.filterwarnings("ignore", category=UserWarning, message="Persisting input arguments took")
 
@@ -2,43 +2,63 @@
 
 from __future__ import annotations
 
+import warnings
+from collections import defaultdict
+from itertools import count
 from typing import TYPE_CHECKING, Sequence
 
 import joblib
+import numpy as np
 from tqdm import tqdm
 
 if TYPE_CHECKING:
     from pathlib import Path
 
-__all__ = ["serialize", "deserialize"]
+    from sklearn.base import BaseEstimator
 
+__all__ = ["serialize", "deserialize", "load_model"]
 
-def serialize(data: Sequence[str | int], path: Path, max_size: int = 100_000, show_progress: bool = False) -> None:
-    """Serialize data to a file
+
+def serialize(data: Sequence[Sequence[str]], path: Path, show_progress: bool = False) -> int:
+    """Serialize tokenized data to a file
+
+    Tokens are mapped to integer IDs and stored as a flat `int32` array at `path`,
+    with document boundaries saved as `.offsets.npy` and the vocabulary as `.vocab.txt`
+    (one token per line, so tokens must not contain newlines).
 
     Args:
-        data: The data to serialize
+        data: The tokenized data to serialize
         path: The path to save the serialized data
-        max_size: The maximum size a chunk can be (in elements)
         show_progress: Whether to show a progress bar
+
+    Returns:
+        The vocabulary size
     """
-    # Split the data into chunks of size `max_size` and serialize each one
-    for i, chunk in enumerate(
-        tqdm(
-            [data[i : i + max_size] for i in range(0, len(data), max_size)],
-            desc="Serializing",
-            unit="chunk",
-            disable=not show_progress,
+    # Assign IDs to tokens in order of first appearance
+    vocab = defaultdict(count().__next__)
+    ids = np.fromiter(
+        (
+            vocab[token]
+            for doc in tqdm(
+                data,
+                desc="Serializing",
+                unit="doc",
+                disable=not show_progress,
+            )
+            for token in doc
         ),
-    ):
-        # The first chunk is saved as `.pkl` and the rest as `.i.pkl`
-        fd = path.with_suffix(f".{i}.pkl" if i else ".pkl")
-        with fd.open("wb") as f:
-            joblib.dump(chunk, f, compress=3)
+        dtype=np.int32,
+    )
+    offsets = np.cumsum([0, *map(len, data)], dtype=np.int64)
 
+    np.save(path, ids)
+    np.save(path.with_suffix(".offsets.npy"), offsets)
+    path.with_suffix(".vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+    return len(vocab)
 
-def deserialize(path: Path) -> Sequence[str | int]:
-    """Deserialize data from a file
+
+def deserialize(path: Path) -> Sequence[Sequence[str]]:
+    """Deserialize tokenized data from a file
 
     Args:
         path: The path to the serialized data
@@ -46,10 +66,33 @@ def deserialize(path: Path) -> Sequence[str | int]:
     Returns:
         The deserialized data
     """
-    data = []
-    i = 0
-    while (fd := path.with_suffix(f".{i}.pkl" if i else ".pkl")).exists():
-        with fd.open("rb") as f:
-            data.extend(joblib.load(f))
-        i += 1
-    return data
+    ids = np.load(path)
+    offsets = np.load(path.with_suffix(".offsets.npy")).tolist()
+    vocab = path.with_suffix(".vocab.txt").read_text(encoding="utf-8").split("\n")
+
+    # Map IDs back to tokens through an object array so each token string is only created once
+    tokens = np.array(vocab, dtype=object)[ids].tolist()
+    return [tokens[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def load_model(path: Path) -> BaseEstimator:
+    """Load a trained model, memory-mapping its arrays when possible
+
+    Models saved without compression are memory-mapped, so repeated loads are served
+    from the page cache. Compressed models are loaded normally.
+
+    Args:
+        path: The path to the model file
+
+    Returns:
+        The loaded model
+    """
+    with warnings.catch_warnings():
+        # joblib only warns about compressed files but then fails to map them anyway
+        warnings.filterwarnings("error", category=UserWarning, message='mmap_mode "r" is not compatible')
+        try:
+            return joblib.load(path, mmap_mode="r")
+        except UserWarning:
+            pass
+
+    return joblib.load(path)